@@ -1,30 +1,79 @@
 from __future__ import annotations
 
 import os
-from contextlib import contextmanager
-from typing import Iterator
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Optional
 
-from sqlalchemy import create_engine
-from sqlalchemy.orm import Session, sessionmaker
+import orjson
+from sqlalchemy.engine import URL, make_url
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 
 DATABASE_URL = os.getenv("DATABASE_URL")
 
 if not DATABASE_URL:
   raise RuntimeError("DATABASE_URL environment variable is required for the backend.")
 
-engine = create_engine(DATABASE_URL, future=True)
-SessionLocal = sessionmaker(bind=engine, autoflush=False, autocommit=False, expire_on_commit=False, class_=Session)
+# Sync driver names mapped to their asyncio counterparts (psycopg 3 supports both modes)
+_ASYNC_DRIVERS = {
+  "postgresql": "postgresql+psycopg",
+  "postgresql+psycopg2": "postgresql+psycopg",
+  "sqlite": "sqlite+aiosqlite",
+  "sqlite+pysqlite": "sqlite+aiosqlite",
+}
 
 
-@contextmanager
-def get_session() -> Iterator[Session]:
-  session = SessionLocal()
+def _async_url(url: str) -> URL:
+  parsed = make_url(url)
+  return parsed.set(drivername=_ASYNC_DRIVERS.get(parsed.drivername, parsed.drivername))
+
+
+def _json_dumps(obj: Any) -> str:
+  # OPT_NON_STR_KEYS keeps stdlib json's handling of int/float dict keys
+  return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS).decode()
+
+
+def _engine_kwargs(url: URL) -> dict[str, Any]:
+  """Pool settings for server databases; SQLite (dev) keeps SQLAlchemy's defaults."""
+  if url.get_backend_name() == "sqlite":
+    return {}
+  return {
+    "pool_size": int(os.getenv("DB_POOL_SIZE", "20")),
+    "max_overflow": int(os.getenv("DB_MAX_OVERFLOW", "30")),
+    "pool_timeout": float(os.getenv("DB_POOL_TIMEOUT", "30")),
+    "pool_recycle": int(os.getenv("DB_POOL_RECYCLE", "1800")),
+    "pool_pre_ping": True,
+    # Reuse the most recently returned connection so idle overflow connections can drain
+    "pool_use_lifo": True,
+  }
+
+
+ASYNC_DATABASE_URL = _async_url(DATABASE_URL)
+engine = create_async_engine(
+  ASYNC_DATABASE_URL,
+  # JSON columns (job results, event data) are encoded/decoded with orjson
+  json_serializer=_json_dumps,
+  json_deserializer=orjson.loads,
+  **_engine_kwargs(ASYNC_DATABASE_URL),
+)
+SessionLocal = async_sessionmaker(bind=engine, autoflush=False, expire_on_commit=False, class_=AsyncSession)
+
+
+@asynccontextmanager
+async def get_session(session: Optional[AsyncSession] = None) -> AsyncIterator[AsyncSession]:
+  """
+  Yield a session and commit on success. Pass an existing session to reuse it:
+  the unit of work is still committed (or rolled back) but the session stays open
+  for the caller, who owns closing it.
+  """
+  owned = session is None
+  if session is None:
+    session = SessionLocal()
   try:
     yield session
-    session.commit()
+    await session.commit()
   except Exception:
-    session.rollback()
+    await session.rollback()
     raise
   finally:
-    session.close()
-
+    if owned:
+      await session.close()
@@ -1,26 +1,36 @@
 from __future__ import annotations
 
 import asyncio
+import multiprocessing
+import os
 import sys
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from contextlib import asynccontextmanager, suppress
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Any, Dict, Literal, Optional
+from typing import Any, AsyncIterator, Callable, Dict, Optional
 from uuid import uuid4
 
+import orjson
 from dotenv import load_dotenv
 from fastapi import FastAPI, HTTPException, Request
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse, StreamingResponse
-from pydantic import BaseModel, Field, ValidationError
+from pydantic import BaseModel, ConfigDict, Field, ValidationError
 
-from .db import engine
-from .models import Base, JobStatus
+from .db import SessionLocal, engine
+from .models import Base, BudgetStyle, JobStatus
 from .repo import (
+  EVENTS_BATCH_LIMIT,
   append_event,
   cancel_job,
   create_job,
   get_events_since,
   get_job,
+  isoformat_utc,
+  run_event_flusher,
   update_job_status,
 )
 
@@ -40,8 +50,78 @@ if str(TRAVEL_CREW_SRC) not in sys.path:
 
 from travel_crew.crew import RunInputs, run_budget_estimate  # noqa: E402
 
+# Crew runs happen in worker processes so their CPU-bound phases don't hold the server's GIL.
+# "spawn" avoids forking a multi-threaded server; workers start lazily on first submit.
+CREW_WORKERS = int(os.getenv("CREW_WORKERS", "2"))
+
+
+def _new_crew_pool() -> ProcessPoolExecutor:
+  return ProcessPoolExecutor(max_workers=CREW_WORKERS, mp_context=multiprocessing.get_context("spawn"))
+
+
+_crew_pool = _new_crew_pool()
+_crew_pool_lock = threading.Lock()
+
+
+def _replace_crew_pool(broken: ProcessPoolExecutor) -> None:
+  """Swap in a fresh pool once a worker died; only the first caller holding the broken pool rebuilds it."""
+  global _crew_pool
+  with _crew_pool_lock:
+    if _crew_pool is broken:
+      _crew_pool = _new_crew_pool()
+  broken.shutdown(wait=False, cancel_futures=True)
+
+
+# One slot per crew worker: a job stays "queued" until it holds a slot, so "running" means a
+# worker is (about to be) busy with it rather than the job waiting in the executor's queue
+_crew_slots = asyncio.Semaphore(CREW_WORKERS)
+
+
+async def _run_in_crew_pool(fn: Callable[..., Any], *args: Any) -> Any:
+  """
+  Run fn in a crew worker process. A dead worker (OOM kill, native crash) breaks the whole
+  ProcessPoolExecutor, so the pool is replaced and BrokenProcessPool fails only the jobs
+  that were running on it; later jobs get the new pool.
+  """
+  pool = _crew_pool
+  try:
+    return await asyncio.get_running_loop().run_in_executor(pool, fn, *args)
+  except BrokenProcessPool:
+    _replace_crew_pool(pool)
+    raise
+
+# Seconds an idle SSE stream waits before sending a keepalive comment
+SSE_KEEPALIVE_S = 20.0
+
+# In-process wakeups for SSE streams: one Event per connected client, keyed by job_id
+_job_event_signals: dict[str, set[asyncio.Event]] = {}
+
+
+def _subscribe(job_id: str) -> asyncio.Event:
+  signal = asyncio.Event()
+  _job_event_signals.setdefault(job_id, set()).add(signal)
+  return signal
+
+
+def _unsubscribe(job_id: str, signal: asyncio.Event) -> None:
+  signals = _job_event_signals.get(job_id)
+  if signals is None:
+    return
+  signals.discard(signal)
+  if not signals:
+    _job_event_signals.pop(job_id, None)
+
+
+def _notify_job_events(job_id: str) -> None:
+  """Wake every SSE stream for job_id after new events were committed."""
+  for signal in _job_event_signals.get(job_id, ()):
+    signal.set()
+
 
 class EstimateJobCreateRequest(BaseModel):
+  # use_enum_values keeps budget_style a plain str for the DB row and the crew worker
+  model_config = ConfigDict(frozen=True, extra="forbid", str_strip_whitespace=True, use_enum_values=True)
+
   trip_title: str = Field(..., min_length=1)
   origin: str = Field(..., min_length=1)
   destination: str = Field(..., min_length=1)
@@ -49,10 +129,12 @@ class EstimateJobCreateRequest(BaseModel):
   end_date: str = Field(..., min_length=1, description="YYYY-MM-DD")
   travelers: int = Field(..., ge=1)
   currency: str = Field(default="MYR", min_length=1)
-  budget_style: Literal["budget", "midrange", "luxury"] = Field(default="midrange")
+  budget_style: BudgetStyle = Field(default=BudgetStyle.midrange.value)
 
 
 class EstimateJobResponse(BaseModel):
+  """Built with model_construct from repo dicts, which already have the right shape and types."""
+
   job_id: str
   status: JobStatus
   created_at: str
@@ -63,69 +145,84 @@ class EstimateJobResponse(BaseModel):
 
 
 async def _run_job(job_id: str, payload: EstimateJobCreateRequest) -> None:
-  await asyncio.to_thread(
-    update_job_status,
-    job_id,
-    status="running",
-    set_started=True,
-  )
-  try:
-    inputs = RunInputs(
-      trip_title=payload.trip_title,
-      origin=payload.origin,
-      destination=payload.destination,
-      start_date=payload.start_date,
-      end_date=payload.end_date,
-      travelers=payload.travelers,
-      currency=payload.currency,
-      budget_style=payload.budget_style,
-    )
-    result = await asyncio.to_thread(run_budget_estimate, inputs, True)
-
-    # Persist result if job wasn't cancelled
-    await asyncio.to_thread(
-      update_job_status,
+  # One session for the job's lifetime; each status update still commits on its own
+  async with _crew_slots, SessionLocal() as session:
+    job = await update_job_status(
       job_id,
-      status="done",
-      result=result,
-      set_finished=True,
-    )
-    await asyncio.to_thread(
-      append_event,
-      job_id,
-      "progress",
-      "Job completed",
-      {"status": "done"},
-    )
-  except ValidationError as e:
-    # Include first few error details so users can see what failed (e.g. field paths and messages)
-    err_detail = "; ".join(
-      f"{'.'.join(str(l) for l in err['loc'])}: {err.get('msg', 'invalid')}"
-      for err in e.errors()[:5]
+      status="running",
+      set_started=True,
+      session=session,
     )
-    error_msg = f"Budget validation failed: {len(e.errors())} field(s) invalid. {err_detail}"
-    await asyncio.to_thread(
-      update_job_status,
-      job_id,
-      status="error",
-      error=error_msg,
-      set_finished=True,
-    )
-  except Exception as e:
-    await asyncio.to_thread(
-      update_job_status,
-      job_id,
-      status="error",
-      error=f"{type(e).__name__}: {e}",
-      set_finished=True,
-    )
-
-
-# Create tables on startup if they don't exist yet
-Base.metadata.create_all(bind=engine)
-
-
-app = FastAPI(title="Travel Budget Estimator API", version="0.1.0")
+    if job is None or job["status"] != "running":
+      # Cancelled while it waited for a worker
+      return
+    try:
+      inputs = RunInputs(
+        trip_title=payload.trip_title,
+        origin=payload.origin,
+        destination=payload.destination,
+        start_date=payload.start_date,
+        end_date=payload.end_date,
+        travelers=payload.travelers,
+        currency=payload.currency,
+        budget_style=payload.budget_style,
+      )
+      result = await _run_in_crew_pool(run_budget_estimate, inputs, True)
+
+      # Persist result if job wasn't cancelled
+      await update_job_status(
+        job_id,
+        status="done",
+        result=result,
+        set_finished=True,
+        session=session,
+      )
+      append_event(
+        job_id,
+        "progress",
+        "Job completed",
+        {"status": "done"},
+      )
+    except ValidationError as e:
+      # Include first few error details so users can see what failed (e.g. field paths and messages)
+      err_detail = "; ".join(
+        f"{'.'.join(str(l) for l in err['loc'])}: {err.get('msg', 'invalid')}"
+        for err in e.errors()[:5]
+      )
+      error_msg = f"Budget validation failed: {len(e.errors())} field(s) invalid. {err_detail}"
+      await update_job_status(
+        job_id,
+        status="error",
+        error=error_msg,
+        set_finished=True,
+        session=session,
+      )
+    except Exception as e:
+      await update_job_status(
+        job_id,
+        status="error",
+        error=f"{type(e).__name__}: {e}",
+        set_finished=True,
+        session=session,
+      )
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+  # Create tables on startup if they don't exist yet
+  async with engine.begin() as conn:
+    await conn.run_sync(Base.metadata.create_all)
+
+  flusher = asyncio.create_task(run_event_flusher(_notify_job_events))
+  yield
+  flusher.cancel()
+  with suppress(asyncio.CancelledError):
+    await flusher
+  _crew_pool.shutdown(wait=False, cancel_futures=True)
+  await engine.dispose()
+
+
+app = FastAPI(title="Travel Budget Estimator API", version="0.1.0", lifespan=lifespan)
 
 app.add_middleware(
   CORSMiddleware,
@@ -159,8 +256,7 @@ def health() -> Dict[str, str]:
 @app.post("/api/estimate-jobs", response_model=EstimateJobResponse)
 async def create_estimate_job(payload: EstimateJobCreateRequest) -> EstimateJobResponse:
   job_id = str(uuid4())
-  job = await asyncio.to_thread(
-    create_job,
+  job = await create_job(
     {
       "trip_title": payload.trip_title,
       "origin": payload.origin,
@@ -175,36 +271,37 @@ async def create_estimate_job(payload: EstimateJobCreateRequest) -> EstimateJobR
   )
 
   asyncio.create_task(_run_job(job_id, payload))
-  return EstimateJobResponse(**job)
+  return EstimateJobResponse.model_construct(**job)
 
 
 @app.get("/api/estimate-jobs/{job_id}", response_model=EstimateJobResponse)
 async def get_estimate_job(job_id: str) -> EstimateJobResponse:
-  job = await asyncio.to_thread(get_job, job_id)
+  job = await get_job(job_id)
   if not job:
     raise HTTPException(status_code=404, detail="Job not found")
-  return EstimateJobResponse(**job)
+  return EstimateJobResponse.model_construct(**job)
 
 
 @app.post("/api/estimate-jobs/{job_id}/cancel", response_model=EstimateJobResponse)
 async def cancel_estimate_job(job_id: str) -> EstimateJobResponse:
-  job = await asyncio.to_thread(cancel_job, job_id)
+  # A queued job is skipped when it gets a worker; a running crew can't be interrupted, so it
+  # keeps its worker until it finishes and the cancelled guard then discards its result
+  job = await cancel_job(job_id)
   if not job:
     raise HTTPException(status_code=404, detail="Job not found")
-  await asyncio.to_thread(
-    append_event,
+  append_event(
     job_id,
     "status",
     "Job cancelled",
     {"status": "cancelled"},
   )
-  return EstimateJobResponse(**job)
+  return EstimateJobResponse.model_construct(**job)
 
 
 @app.get("/api/estimate-jobs/{job_id}/events")
 async def stream_estimate_job_events(request: Request, job_id: str):
   # Basic existence check
-  job = await asyncio.to_thread(get_job, job_id)
+  job = await get_job(job_id)
   if not job:
     raise HTTPException(status_code=404, detail="Job not found")
 
@@ -216,24 +313,46 @@ async def stream_estimate_job_events(request: Request, job_id: str):
 
   async def event_generator():
     nonlocal last_id
-    while True:
-      if await request.is_disconnected():
-        break
-
-      events = await asyncio.to_thread(get_events_since, job_id, last_id)
-      for ev in events:
-        last_id = ev.id
-        payload = {
-          "type": ev.type,
-          "message": ev.message,
-          "created_at": ev.created_at.isoformat(),
-          "data": ev.data,
-        }
-        yield f"id: {ev.id}\n"
-        yield f"event: {ev.type}\n"
-        yield f"data: {payload}\n\n"
-
-      await asyncio.sleep(1.0)
-
-  return StreamingResponse(event_generator(), media_type="text/event-stream")
+    signal = _subscribe(job_id)
+    try:
+      while True:
+        if await request.is_disconnected():
+          break
+
+        # Clear before reading so a notification racing with the query is not lost
+        signal.clear()
+        events = await get_events_since(job_id, last_id)
+        for ev in events:
+          last_id = ev.id
+          payload = {
+            "type": ev.type,
+            "message": ev.message,
+            "created_at": isoformat_utc(ev.created_at),
+            "data": ev.data,
+          }
+          # One chunk per event so each is a single write to the socket
+          yield b"".join((
+            b"id: ", str(ev.id).encode(), b"\n",
+            b"event: ", ev.type.encode(), b"\n",
+            b"data: ", orjson.dumps(payload), b"\n\n",
+          ))
+
+        if len(events) >= EVENTS_BATCH_LIMIT:
+          # More rows are likely pending; read the next batch without waiting
+          continue
+
+        waiter = asyncio.ensure_future(signal.wait())
+        done, _ = await asyncio.wait({waiter}, timeout=SSE_KEEPALIVE_S)
+        if not done:
+          waiter.cancel()
+          yield b": keepalive\n\n"
+    finally:
+      _unsubscribe(job_id, signal)
+
+  return StreamingResponse(
+    event_generator(),
+    media_type="text/event-stream",
+    # Disable proxy buffering (nginx) so events are delivered as soon as they are written
+    headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+  )
 
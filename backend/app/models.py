@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 from datetime import datetime
+from enum import StrEnum
 from typing import Any, Literal, Optional
 
 from sqlalchemy import JSON, DateTime, Index, String, Text
@@ -10,6 +11,12 @@ from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column
 JobStatus = Literal["queued", "running", "done", "error", "cancelled"]
 
 
+class BudgetStyle(StrEnum):
+  budget = "budget"
+  midrange = "midrange"
+  luxury = "luxury"
+
+
 class Base(DeclarativeBase):
   pass
 
@@ -28,7 +35,7 @@ class EstimateJob(Base):
   end_date: Mapped[str] = mapped_column(String(32))
   travelers: Mapped[int]
   currency: Mapped[str] = mapped_column(String(16))
-  budget_style: Mapped[str] = mapped_column(String(32))
+  budget_style: Mapped[BudgetStyle] = mapped_column(String(32))
 
   status: Mapped[str] = mapped_column(String(16), index=True)
   created_at: Mapped[datetime]
@@ -55,5 +62,7 @@ class EstimateJobEvent(Base):
 
   __table_args__ = (
     Index("ix_estimate_job_events_job_created", "job_id", "created_at"),
+    # Serves get_events_since: seek on job_id, rows already ordered by id
+    Index("ix_estimate_job_events_job_id_id", "job_id", "id"),
   )
 
@@ -1,21 +1,55 @@
 from __future__ import annotations
 
+import asyncio
+import logging
 from datetime import UTC, datetime
-from typing import Any, Iterable, Optional
+from typing import Any, Callable, Optional, Sequence
 
-from sqlalchemy import select
-from sqlalchemy.orm import Session
+from sqlalchemy import Row, func, insert, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from .db import get_session
 from .models import EstimateJob, EstimateJobEvent, JobStatus
 
+logger = logging.getLogger(__name__)
+
+# Upper bound on events returned per get_events_since call
+EVENTS_BATCH_LIMIT = 500
+
+# append_event rows are buffered and written by run_event_flusher in multi-row INSERTs
+EVENT_FLUSH_MAX_BATCH = 50
+EVENT_FLUSH_LINGER_S = 0.05
+# A failed batch is retried with exponential backoff before it is dropped
+EVENT_FLUSH_ATTEMPTS = 4
+EVENT_FLUSH_RETRY_S = 0.25
+_event_queue: asyncio.Queue[dict[str, Any]] = asyncio.Queue()
+
+# Columns exposed by job_to_dict; reads select these instead of hydrating EstimateJob
+_JOB_COLUMNS = (
+  EstimateJob.job_id,
+  EstimateJob.status,
+  EstimateJob.created_at,
+  EstimateJob.started_at,
+  EstimateJob.finished_at,
+  EstimateJob.error,
+  EstimateJob.result,
+)
+
 
 def utcnow() -> datetime:
   return datetime.now(UTC)
 
 
-def create_job(payload: dict[str, Any], job_id: str) -> dict[str, Any]:
-  with get_session() as session:
+def isoformat_utc(value: datetime) -> str:
+  """ISO-8601 with an explicit UTC offset; backends without tz support (SQLite) return naive UTC values."""
+  if value.tzinfo is None:
+    value = value.replace(tzinfo=UTC)
+  return value.isoformat()
+
+
+async def create_job(payload: dict[str, Any], job_id: str) -> dict[str, Any]:
+  now = utcnow()
+  async with get_session() as session:
     job = EstimateJob(
       job_id=job_id,
       trip_title=payload["trip_title"],
@@ -27,36 +61,31 @@ def create_job(payload: dict[str, Any], job_id: str) -> dict[str, Any]:
       currency=payload["currency"],
       budget_style=payload["budget_style"],
       status="queued",
-      created_at=utcnow(),
+      created_at=now,
       started_at=None,
       finished_at=None,
       error=None,
       result=None,
     )
     session.add(job)
-    session.flush()
+    await session.flush()
+    out = job_to_dict(job)
 
-    _append_event_in_session(
-      session,
-      job_id=job_id,
-      type="status",
-      message="Job queued",
-      data={"status": "queued"},
-    )
+  # Queued only once the job row is committed
+  append_event(job_id, "status", "Job queued", {"status": "queued"})
+  return out
 
-    return job_to_dict(job)
 
-
-def get_job(job_id: str) -> Optional[dict[str, Any]]:
-  with get_session() as session:
-    stmt = select(EstimateJob).where(EstimateJob.job_id == job_id)
-    job = session.scalar(stmt)
-    if not job:
+async def get_job(job_id: str) -> Optional[dict[str, Any]]:
+  async with get_session() as session:
+    stmt = select(*_JOB_COLUMNS).where(EstimateJob.job_id == job_id)
+    row = (await session.execute(stmt)).one_or_none()
+    if row is None:
       return None
-    return job_to_dict(job)
+    return job_to_dict(row)
 
 
-def update_job_status(
+async def update_job_status(
   job_id: str,
   *,
   status: JobStatus,
@@ -64,86 +93,140 @@ def update_job_status(
   result: Optional[dict[str, Any]] = None,
   set_started: bool = False,
   set_finished: bool = False,
+  session: Optional[AsyncSession] = None,
 ) -> Optional[dict[str, Any]]:
-  with get_session() as session:
-    stmt = select(EstimateJob).where(EstimateJob.job_id == job_id).with_for_update()
-    job = session.scalar(stmt)
-    if not job:
-      return None
-
-    # Do not overwrite a cancelled job with a completed result
-    if job.status == "cancelled" and status in ("done", "error"):
-      return job_to_dict(job)
-
-    job.status = status
-    now = utcnow()
-    if set_started and job.started_at is None:
-      job.started_at = now
-    if set_finished:
-      job.finished_at = now
-    if error is not None:
-      job.error = error
-    if result is not None:
-      job.result = result
-
-    message = f"Status changed to {status}"
-    if error:
-      message = f"Error: {error}"
-
-    _append_event_in_session(
-      session,
-      job_id=job_id,
-      type="status",
-      message=message,
-      data={"status": status},
-    )
-
-    return job_to_dict(job)
-
-
-def cancel_job(job_id: str) -> Optional[dict[str, Any]]:
-  return update_job_status(job_id, status="cancelled", set_finished=True)
+  now = utcnow()
+  values: dict[str, Any] = {"status": status}
+  if set_started:
+    values["started_at"] = func.coalesce(EstimateJob.started_at, now)
+  if set_finished:
+    values["finished_at"] = now
+  if error is not None:
+    values["error"] = error
+  if result is not None:
+    values["result"] = result
+
+  stmt = update(EstimateJob).where(EstimateJob.job_id == job_id)
+  if status in ("running", "done", "error"):
+    # Do not restart or overwrite a cancelled job
+    stmt = stmt.where(EstimateJob.status != "cancelled")
+  stmt = stmt.values(**values).returning(*_JOB_COLUMNS)
+
+  async with get_session(session) as session:
+    job = (await session.execute(stmt)).one_or_none()
+    if job is None:
+      # Unknown job, or a cancelled one the guard skipped: report its current state
+      existing = (await session.execute(select(*_JOB_COLUMNS).where(EstimateJob.job_id == job_id))).one_or_none()
+      return job_to_dict(existing) if existing else None
+
+  # Queued after the commit, like every event, so event ids follow created_at
+  message = f"Error: {error}" if error else f"Status changed to {status}"
+  append_event(job_id, "status", message, {"status": status})
+  return job_to_dict(job)
+
+
+async def cancel_job(job_id: str) -> Optional[dict[str, Any]]:
+  return await update_job_status(job_id, status="cancelled", set_finished=True)
 
 
 def append_event(job_id: str, type: str, message: str, data: Optional[dict[str, Any]] = None) -> None:
-  with get_session() as session:
-    _append_event_in_session(session, job_id=job_id, type=type, message=message, data=data)
-
-
-def _append_event_in_session(
-  session: Session,
-  *,
-  job_id: str,
-  type: str,
-  message: str,
-  data: Optional[dict[str, Any]] = None,
-) -> None:
-  event = EstimateJobEvent(
-    job_id=job_id,
-    created_at=utcnow(),
-    type=type,
-    message=message,
-    data=data,
-  )
-  session.add(event)
-
-
-def get_events_since(job_id: str, last_id: Optional[int] = None) -> Iterable[EstimateJobEvent]:
-  with get_session() as session:
-    stmt = select(EstimateJobEvent).where(EstimateJobEvent.job_id == job_id)
+  """
+  Queue an event; it is committed by run_event_flusher shortly afterwards. Every
+  event goes through this one FIFO queue and is stamped here, so event ids (the
+  SSE resume order) always agree with created_at.
+  """
+  _event_queue.put_nowait({
+    "job_id": job_id,
+    "created_at": utcnow(),
+    "type": type,
+    "message": message,
+    "data": data,
+  })
+
+
+async def _insert_events(events: list[dict[str, Any]]) -> None:
+  async with get_session() as session:
+    await session.execute(insert(EstimateJobEvent), events)
+
+
+async def _flush_events(events: list[dict[str, Any]], on_flush: Callable[[str], None]) -> None:
+  for attempt in range(1, EVENT_FLUSH_ATTEMPTS + 1):
+    try:
+      await _insert_events(events)
+      break
+    except Exception:
+      if attempt == EVENT_FLUSH_ATTEMPTS:
+        logger.exception("Dropping %s queued job event(s) after %s failed writes", len(events), attempt)
+        return
+      logger.warning("Writing %s queued job event(s) failed (attempt %s), retrying", len(events), attempt, exc_info=True)
+      await asyncio.sleep(EVENT_FLUSH_RETRY_S * 2 ** (attempt - 1))
+  for job_id in {ev["job_id"] for ev in events}:
+    on_flush(job_id)
+
+
+async def run_event_flusher(on_flush: Callable[[str], None]) -> None:
+  """
+  Write queued append_event rows until cancelled. A batch is flushed once it
+  reaches EVENT_FLUSH_MAX_BATCH events or EVENT_FLUSH_LINGER_S after its first
+  event; on_flush(job_id) runs for every job that had events committed. A
+  failed write is retried (EVENT_FLUSH_ATTEMPTS in total) before it is logged
+  and dropped.
+  """
+  loop = asyncio.get_running_loop()
+  batch: list[dict[str, Any]] = []
+  inflight: Optional[asyncio.Task[None]] = None
+  try:
+    while True:
+      batch.append(await _event_queue.get())
+      deadline = loop.time() + EVENT_FLUSH_LINGER_S
+      while len(batch) < EVENT_FLUSH_MAX_BATCH:
+        timeout = deadline - loop.time()
+        if timeout <= 0:
+          break
+        try:
+          batch.append(await asyncio.wait_for(_event_queue.get(), timeout))
+        except TimeoutError:
+          break
+      # Shielded, and batch handed off first: a cancel mid-write must neither abort nor resend it
+      inflight = asyncio.ensure_future(_flush_events(batch, on_flush))
+      batch = []
+      await asyncio.shield(inflight)
+      inflight = None
+  except asyncio.CancelledError:
+    # Shutdown: let an interrupted write finish, then write whatever is still buffered
+    if inflight is not None:
+      await inflight
+    while not _event_queue.empty():
+      batch.append(_event_queue.get_nowait())
+    if batch:
+      await _flush_events(batch, on_flush)
+    raise
+
+
+async def get_events_since(job_id: str, last_id: Optional[int] = None) -> Sequence[Row[Any]]:
+  """Return up to EVENTS_BATCH_LIMIT (id, type, message, created_at, data) rows after last_id."""
+  async with get_session() as session:
+    stmt = select(
+      EstimateJobEvent.id,
+      EstimateJobEvent.type,
+      EstimateJobEvent.message,
+      EstimateJobEvent.created_at,
+      EstimateJobEvent.data,
+    ).where(EstimateJobEvent.job_id == job_id)
     if last_id is not None:
       stmt = stmt.where(EstimateJobEvent.id > last_id)
-    stmt = stmt.order_by(EstimateJobEvent.id.asc())
-    return list(session.scalars(stmt))
+    stmt = stmt.order_by(EstimateJobEvent.id.asc()).limit(EVENTS_BATCH_LIMIT)
+    return (await session.execute(stmt)).all()
 
 
-def job_to_dict(job: EstimateJob) -> dict[str, Any]:
+def job_to_dict(job: EstimateJob | Row[Any]) -> dict[str, Any]:
+  """Serialize an EstimateJob, or a row selected with _JOB_COLUMNS, for API responses."""
   return {
     "job_id": job.job_id,
     "status": job.status,
-    "created_at": job.created_at.isoformat(),
-    "started_at": job.started_at.isoformat() if job.started_at else None,
-    "finished_at": job.finished_at.isoformat() if job.finished_at else None,
+    "created_at": isoformat_utc(job.created_at),
+    "started_at": isoformat_utc(job.started_at) if job.started_at else None,
+    "finished_at": isoformat_utc(job.finished_at) if job.finished_at else None,
     "error": job.error,
     "result": job.result,
   }
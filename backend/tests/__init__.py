@@ -0,0 +1,5 @@
+import os
+import tempfile
+
+# backend.app.db requires DATABASE_URL at import; tests share one throwaway SQLite file
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{tempfile.mkdtemp(prefix='tbe-tests-')}/test.db")
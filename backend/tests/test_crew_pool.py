@@ -0,0 +1,91 @@
+from __future__ import annotations
+
+import asyncio
+import os
+import unittest
+import uuid
+from concurrent.futures.process import BrokenProcessPool
+from unittest import mock
+
+from backend.app import main, repo
+from backend.app.db import engine
+from backend.app.models import Base
+
+
+class CrewPoolRecoveryTest(unittest.IsolatedAsyncioTestCase):
+  async def test_next_job_runs_after_worker_dies(self) -> None:
+    broken = main._crew_pool
+
+    # A worker exiting mid-task is what an OOM kill or native crash looks like to the pool
+    with self.assertRaises(BrokenProcessPool):
+      await main._run_in_crew_pool(os._exit, 1)
+    self.assertIsNot(main._crew_pool, broken)
+
+    pid = await main._run_in_crew_pool(os.getpid)
+    self.assertNotEqual(pid, os.getpid())
+
+  async def asyncTearDown(self) -> None:
+    main._crew_pool.shutdown(wait=True)
+
+
+class CrewSlotTest(unittest.IsolatedAsyncioTestCase):
+  async def asyncSetUp(self) -> None:
+    async with engine.begin() as conn:
+      await conn.run_sync(Base.metadata.create_all)
+    self.release = asyncio.Event()
+    self.started: list[str] = []
+
+    async def fake_run(fn, inputs, *args):
+      self.started.append(inputs.trip_title)
+      await self.release.wait()
+      return {}
+
+    for patcher in (
+      mock.patch.object(main, "_crew_slots", asyncio.Semaphore(1)),
+      mock.patch.object(main, "_run_in_crew_pool", fake_run),
+      mock.patch.object(repo, "_event_queue", asyncio.Queue()),
+    ):
+      patcher.start()
+      self.addCleanup(patcher.stop)
+
+  async def asyncTearDown(self) -> None:
+    async with engine.begin() as conn:
+      await conn.run_sync(Base.metadata.drop_all)
+    await engine.dispose()
+
+  async def _start(self, title: str) -> tuple[str, asyncio.Task[None]]:
+    payload = main.EstimateJobCreateRequest(
+      trip_title=title,
+      origin="KUL",
+      destination="NRT",
+      start_date="2026-11-01",
+      end_date="2026-11-05",
+      travelers=1,
+    )
+    job_id = uuid.uuid4().hex
+    await repo.create_job(payload.model_dump(), job_id)
+    return job_id, asyncio.create_task(main._run_job(job_id, payload))
+
+  async def test_job_stays_queued_until_a_worker_is_free(self) -> None:
+    first, first_task = await self._start("first")
+    second, second_task = await self._start("second")
+    while not self.started:
+      await asyncio.sleep(0.01)
+
+    self.assertEqual((await repo.get_job(first))["status"], "running")
+    self.assertEqual((await repo.get_job(second))["status"], "queued")
+
+    # Cancelled while waiting for a worker: it must never start
+    await repo.cancel_job(second)
+    self.release.set()
+    await asyncio.gather(first_task, second_task)
+
+    self.assertEqual(self.started, ["first"])
+    self.assertEqual((await repo.get_job(first))["status"], "done")
+    second_job = await repo.get_job(second)
+    self.assertEqual(second_job["status"], "cancelled")
+    self.assertIsNone(second_job["started_at"])
+
+
+if __name__ == "__main__":
+  unittest.main()
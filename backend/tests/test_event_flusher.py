@@ -0,0 +1,114 @@
+from __future__ import annotations
+
+import asyncio
+import unittest
+import uuid
+from unittest import mock
+
+from backend.app import repo
+from backend.app.db import engine
+from backend.app.models import Base
+
+
+class EventFlusherTest(unittest.IsolatedAsyncioTestCase):
+  async def asyncSetUp(self) -> None:
+    async with engine.begin() as conn:
+      await conn.run_sync(Base.metadata.create_all)
+    # The module queue binds to the first loop that waits on it; each test gets its own loop
+    patcher = mock.patch.object(repo, "_event_queue", asyncio.Queue())
+    patcher.start()
+    self.addCleanup(patcher.stop)
+    self.flushed: list[str] = []
+    self.flusher = asyncio.create_task(repo.run_event_flusher(self.flushed.append))
+
+  async def asyncTearDown(self) -> None:
+    await self._stop_flusher()
+    async with engine.begin() as conn:
+      await conn.run_sync(Base.metadata.drop_all)
+    await engine.dispose()
+
+  async def _stop_flusher(self) -> None:
+    self.flusher.cancel()
+    try:
+      await self.flusher
+    except asyncio.CancelledError:
+      pass
+
+  async def _create_job(self) -> str:
+    job_id = uuid.uuid4().hex
+    await repo.create_job(
+      {
+        "trip_title": "Test trip",
+        "origin": "KUL",
+        "destination": "NRT",
+        "start_date": "2026-11-01",
+        "end_date": "2026-11-05",
+        "travelers": 2,
+        "currency": "MYR",
+        "budget_style": "midrange",
+      },
+      job_id,
+    )
+    return job_id
+
+  async def test_status_and_appended_events_share_one_order(self) -> None:
+    job_id = await self._create_job()
+    running = await repo.update_job_status(job_id, status="running", set_started=True)
+    # SQLite hands back naive datetimes; the API still reports them as UTC
+    self.assertTrue(running["created_at"].endswith("+00:00"))
+    self.assertTrue(running["started_at"].endswith("+00:00"))
+    repo.append_event(job_id, "progress", "Planning", None)
+    await repo.cancel_job(job_id)
+    repo.append_event(job_id, "status", "Job cancelled", {"status": "cancelled"})
+    # Skipped by the cancelled guard, so it must not add an event
+    await repo.update_job_status(job_id, status="done", result={}, set_finished=True)
+    await self._stop_flusher()
+
+    rows = await repo.get_events_since(job_id)
+    self.assertEqual(
+      [row.message for row in rows],
+      [
+        "Job queued",
+        "Status changed to running",
+        "Planning",
+        "Status changed to cancelled",
+        "Job cancelled",
+      ],
+    )
+    created = [row.created_at for row in rows]
+    self.assertEqual(created, sorted(created))
+    self.assertIn(job_id, self.flushed)
+
+  async def test_shutdown_writes_buffered_events(self) -> None:
+    job_id = uuid.uuid4().hex
+    count = repo.EVENT_FLUSH_MAX_BATCH * 2 + 7
+    for i in range(count):
+      repo.append_event(job_id, "progress", f"step {i}", None)
+    await self._stop_flusher()
+
+    rows = await repo.get_events_since(job_id)
+    self.assertEqual([row.message for row in rows], [f"step {i}" for i in range(count)])
+
+  async def test_cancel_during_write_does_not_resend_batch(self) -> None:
+    job_id = uuid.uuid4().hex
+    insert_events = repo._insert_events
+    written = asyncio.Event()
+
+    async def slow_insert(events):
+      await insert_events(events)
+      written.set()
+      await asyncio.sleep(0.1)
+
+    with mock.patch.object(repo, "_insert_events", slow_insert):
+      for i in range(3):
+        repo.append_event(job_id, "progress", f"step {i}", None)
+      await written.wait()
+      await self._stop_flusher()
+
+    rows = await repo.get_events_since(job_id)
+    self.assertEqual([row.message for row in rows], ["step 0", "step 1", "step 2"])
+    self.assertEqual(self.flushed, [job_id])
+
+
+if __name__ == "__main__":
+  unittest.main()
@@ -97,7 +97,7 @@ function App() {
 
     source.onmessage = (event) => {
       try {
-        const payload = JSON.parse(event.data.replace(/'/g, '"'))
+        const payload = JSON.parse(event.data)
         if (!cancelled) {
           setEvents((prev) => [...prev, payload])
         }
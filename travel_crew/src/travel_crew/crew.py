@@ -1,16 +1,25 @@
 from __future__ import annotations
 
+import asyncio
 import json
 import logging
-import re
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 from datetime import datetime
+from functools import cache
 from pathlib import Path
 from typing import Any, Dict
 
 logger = logging.getLogger(__name__)
 
+import orjson
 import yaml
+try:
+  from yaml import CSafeLoader as _SafeLoader
+except ImportError:  # PyYAML built without libyaml
+  from yaml import SafeLoader as _SafeLoader
 from crewai import Agent, Task, Crew, Process
 from pydantic import ValidationError
 
@@ -22,13 +31,71 @@ from dotenv import load_dotenv
 load_dotenv()
 
 CONFIG_DIR = Path(__file__).resolve().parent / "config"
-# Fallback for backward compatibility when brace-matching finds nothing
-JSON_OBJECT_RE = re.compile(r"\{.*\}", re.DOTALL)
+_CFG_PATH = CONFIG_DIR / "config.yaml"
+_AGENTS_PATH = CONFIG_DIR / "agents.yaml"
+_TASKS_PATH = CONFIG_DIR / "tasks.yaml"
+# Parses one JSON value from an offset and reports where it ended, ignoring trailing text
+_JSON_DECODER = json.JSONDecoder()
 
 
 def load_yaml(path: Path) -> Dict[str, Any]:
-  with path.open("r", encoding="utf-8") as f:
-    return yaml.safe_load(f)
+  with open(path, "r", encoding="utf-8") as f:
+    return yaml.load(f, Loader=_SafeLoader)
+
+
+_CFG_FILES = (_CFG_PATH, _AGENTS_PATH, _TASKS_PATH)
+
+
+def _task_base(shared_cfg: Dict[str, Any]) -> Dict[str, Any]:
+  """Template values for tasks that come from config.yaml alone (no run inputs)."""
+  base = dict(shared_cfg.get("assumptions", {}))
+  base.update({
+    "buffers": shared_cfg.get("buffers", {}),
+    "rounding": shared_cfg.get("currency", {}).get("rounding", {}),
+  })
+  return base
+
+
+def _read_cfg_snapshot() -> Dict[str, Any]:
+  """Parse the config files into {"shared", "agents", "tasks", "task_base"}."""
+  # Overlap the three file reads/parses; this runs once per process and config change
+  with ThreadPoolExecutor(max_workers=len(_CFG_FILES)) as ex:
+    shared_cfg, agents_cfg, tasks_cfg = ex.map(load_yaml, _CFG_FILES)
+  return {
+    "shared": shared_cfg,
+    "agents": agents_cfg,
+    "tasks": tasks_cfg,
+    "task_base": _task_base(shared_cfg),
+  }
+
+
+# The current snapshot and the (mtime_ns, size) of each config file it was read from
+_CFG_MEMO: tuple[tuple[tuple[int, int], ...], Dict[str, Any]] | None = None
+_CFG_MEMO_LOCK = threading.Lock()
+
+
+def _cfg_stat_key() -> tuple[tuple[int, int], ...]:
+  return tuple((st.st_mtime_ns, st.st_size) for st in map(os.stat, _CFG_FILES))
+
+
+def _load_merged_cfg() -> Dict[str, Any]:
+  """
+  Return the merged config snapshot, kept in memory while the three files' mtime
+  and size are unchanged; only a change (or a new process) goes to _read_cfg_snapshot.
+  The snapshot is shared between runs, so callers must not mutate it.
+  """
+  global _CFG_MEMO
+  key = _cfg_stat_key()
+  memo = _CFG_MEMO
+  if memo is not None and memo[0] == key:
+    return memo[1]
+  with _CFG_MEMO_LOCK:
+    memo = _CFG_MEMO
+    if memo is not None and memo[0] == key:
+      return memo[1]
+    cfg = _read_cfg_snapshot()
+    _CFG_MEMO = (key, cfg)
+  return cfg
 
 
 def _strip_code_fences(text: str) -> str:
@@ -46,50 +113,10 @@ def _strip_code_fences(text: str) -> str:
   return s.strip()
 
 
-def _extract_brace_object(text: str) -> str | None:
-  """Extract the first complete top-level {...} object using brace-matching."""
-  start = text.find("{")
-  if start == -1:
-    return None
-  depth = 0
-  in_string = False
-  escape = False
-  quote_char = None
-  i = start
-  while i < len(text):
-    c = text[i]
-    if escape:
-      escape = False
-      i += 1
-      continue
-    if c == "\\" and in_string:
-      escape = True
-      i += 1
-      continue
-    if in_string:
-      if c == quote_char:
-        in_string = False
-      i += 1
-      continue
-    if c in ('"', "'"):
-      in_string = True
-      quote_char = c
-      i += 1
-      continue
-    if c == "{":
-      depth += 1
-    elif c == "}":
-      depth -= 1
-      if depth == 0:
-        return text[start : i + 1]
-    i += 1
-  return None
-
-
 def extract_json(text: str) -> Dict[str, Any]:
   """
   Extract a single JSON object from text that may contain markdown fences or
-  surrounding commentary. Uses fence stripping and brace-matching for robustness.
+  surrounding commentary. Uses fence stripping and decoding from the first "{".
   """
   text = _strip_code_fences(text)
   if not text:
@@ -97,32 +124,35 @@ def extract_json(text: str) -> Dict[str, Any]:
 
   # Try direct parse first
   try:
-    obj = json.loads(text)
+    obj = orjson.loads(text)
+  except orjson.JSONDecodeError:
+    pass
+  else:
     if isinstance(obj, dict):
       return obj
     raise ValueError("Parsed JSON is not an object.")
-  except json.JSONDecodeError:
-    pass
 
-  # Extract first balanced {...} object
-  candidate = _extract_brace_object(text)
-  if candidate:
+  # Decode the object starting at the first "{" in one pass; commentary after it is ignored
+  start = text.find("{")
+  if start != -1:
     try:
-      obj = json.loads(candidate)
-      if isinstance(obj, dict):
-        return obj
+      obj, _ = _JSON_DECODER.raw_decode(text, start)
     except json.JSONDecodeError:
       pass
+    else:
+      if isinstance(obj, dict):
+        return obj
 
-  # Fallback: greedy regex (backward compatibility)
-  m = JSON_OBJECT_RE.search(text)
-  if m:
+  # Fallback: first "{" to last "}" (what the old greedy regex matched), found in linear time
+  end = text.rfind("}")
+  if start != -1 and end > start:
     try:
-      obj = json.loads(m.group(0))
+      obj = orjson.loads(text[start : end + 1])
+    except orjson.JSONDecodeError:
+      pass
+    else:
       if isinstance(obj, dict):
         return obj
-    except json.JSONDecodeError:
-      pass
 
   raise ValueError("Could not parse valid JSON object from crew output.")
 
@@ -162,14 +192,30 @@ ESTIMATES_KEY_MAP = {
 }
 
 
+ESTIMATE_KEYS = ("flights", "stay", "transport", "food", "activities", "docs_fees")
+
+
 def _normalize_line_item(item: Any) -> Dict[str, Any]:
-  if isinstance(item, dict):
-    name = item.get("name") or item.get("item") or item.get("label") or str(item.get("amount", ""))
-    amount = item.get("amount")
-    if amount is None:
-      amount = item.get("value") or item.get("cost") or 0
-    return {"name": str(name).strip() or "Item", "amount": float(amount)}
-  return {"name": "Item", "amount": 0.0}
+  if not isinstance(item, dict):
+    return {"name": "Item", "amount": 0.0}
+  get = item.get
+  amount = get("amount")
+  name = get("name") or get("item") or get("label") or ("" if amount is None else amount)
+  if amount is None:
+    amount = get("value") or get("cost") or 0
+  name = name.strip() if type(name) is str else str(name).strip()
+  return {"name": name or "Item", "amount": float(amount)}
+
+
+def _clean_strings(values: list[Any]) -> list[str]:
+  """Stringify and strip each value once, dropping empties."""
+  cleaned: list[str] = []
+  append = cleaned.append
+  for v in values:
+    s = v.strip() if type(v) is str else str(v).strip()
+    if s:
+      append(s)
+  return cleaned
 
 
 def _normalize_estimates_and_totals(data: Dict[str, Any]) -> None:
@@ -178,18 +224,18 @@ def _normalize_estimates_and_totals(data: Dict[str, Any]) -> None:
   if not isinstance(estimates, dict):
     return
 
-  schema_keys = ("flights", "stay", "transport", "food", "activities", "docs_fees")
   normalized: Dict[str, Any] = {}
   for key, val in estimates.items():
     if not isinstance(val, dict):
       continue
     k = key.lower().replace(" ", "_").replace("-", "_")
     canonical = ESTIMATES_KEY_MAP.get(k, k)
-    if canonical in schema_keys:
+    if canonical in ESTIMATE_KEYS:
       normalized[canonical] = val
 
-  for cat_key in ("flights", "stay", "transport", "food", "activities", "docs_fees"):
-    if cat_key not in normalized:
+  for cat_key in ESTIMATE_KEYS:
+    cat = normalized.get(cat_key)
+    if cat is None:
       normalized[cat_key] = {
         "low": 0.0,
         "base": 0.0,
@@ -198,14 +244,14 @@ def _normalize_estimates_and_totals(data: Dict[str, Any]) -> None:
         "assumptions": [],
         "confidence": 0.5,
       }
-    cat = normalized[cat_key]
-    if not isinstance(cat.get("line_items"), list):
-      cat["line_items"] = []
-    cat["line_items"] = [_normalize_line_item(i) for i in cat["line_items"]]
-    if not isinstance(cat.get("assumptions"), list):
-      cat["assumptions"] = [str(cat.get("assumptions", ""))] if cat.get("assumptions") else []
-    cat["assumptions"] = [str(a).strip() for a in cat["assumptions"] if str(a).strip()]
-    if "confidence" not in cat or cat["confidence"] is None:
+      continue
+    line_items = cat.get("line_items")
+    cat["line_items"] = [_normalize_line_item(i) for i in line_items] if isinstance(line_items, list) else []
+    assumptions = cat.get("assumptions")
+    if not isinstance(assumptions, list):
+      assumptions = [assumptions] if assumptions else []
+    cat["assumptions"] = _clean_strings(assumptions)
+    if cat.get("confidence") is None:
       cat["confidence"] = 0.5
   data["estimates"] = normalized
 
@@ -255,6 +301,31 @@ def _normalize_estimates_and_totals(data: Dict[str, Any]) -> None:
       validation["recommendations"] = []
 
 
+# LLM meta variants (nested or renamed source path -> schema field); sources are dropped afterwards
+_META_RENAMES = (
+  (("trip_dates", "start"), "start_date"),
+  (("trip_dates", "end"), "end_date"),
+  (("duration", "days"), "days"),
+  (("duration", "nights"), "nights"),
+  (("party_size",), "travelers"),
+)
+_MISSING = object()
+
+
+def _apply_renames(meta: Dict[str, Any], table: tuple[tuple[tuple[str, ...], str], ...]) -> None:
+  """Copy each source path onto its target field unless the target is already set, then drop the sources."""
+  for path, target in table:
+    if target in meta:
+      continue
+    value = meta.get(path[0], _MISSING)
+    for key in path[1:]:
+      value = value.get(key, _MISSING) if isinstance(value, dict) else _MISSING
+    if value is not _MISSING:
+      meta[target] = value
+  for path, _ in table:
+    meta.pop(path[0], None)
+
+
 @dataclass
 class RunInputs:
   trip_title: str
@@ -267,15 +338,21 @@ class RunInputs:
   budget_style: str = "midrange"  # budget | midrange | luxury
 
 
-def build_agents(agents_cfg: Dict[str, Any], shared_cfg: Dict[str, Any], inputs: Dict[str, Any]) -> Dict[str, Agent]:
+@cache
+def _shared_tools() -> tuple[AmadeusFlightOffersTool, AgodaStaySearchTool]:
+  """One instance of each tool per process (and one API client behind it); tools keep no per-call state."""
+  return AmadeusFlightOffersTool(), AgodaStaySearchTool()
+
+
+def build_agents(agents_cfg: Dict[str, Any], shared_cfg: Dict[str, Any]) -> Dict[str, Agent]:
+  """Agents keep their {placeholder} templates; Crew.kickoff(inputs=...) fills them per run."""
   defaults = shared_cfg.get("defaults", {})
   llm_model = defaults.get("llm_model", "gpt-4o-mini")
   temperature = float(defaults.get("temperature", 0.2))
   max_iter = int(defaults.get("max_iter", 3))
   verbose = bool(defaults.get("verbose", False))
 
-  amadeus_flights_tool = AmadeusFlightOffersTool()
-  agoda_tool = AgodaStaySearchTool()
+  amadeus_flights_tool, agoda_tool = _shared_tools()
 
   agents: Dict[str, Agent] = {}
   for agent_name, spec in agents_cfg.items():
@@ -286,9 +363,9 @@ def build_agents(agents_cfg: Dict[str, Any], shared_cfg: Dict[str, Any], inputs:
       tools = [agoda_tool]
 
     agents[agent_name] = Agent(
-      role=spec["role"].format(**inputs),
-      goal=spec["goal"].format(**inputs),
-      backstory=spec["backstory"].format(**inputs),
+      role=spec["role"],
+      goal=spec["goal"],
+      backstory=spec["backstory"],
       llm=llm_model,
       tools=tools,
       temperature=temperature,
@@ -298,22 +375,16 @@ def build_agents(agents_cfg: Dict[str, Any], shared_cfg: Dict[str, Any], inputs:
   return agents
 
 
-def build_tasks(tasks_cfg: Dict[str, Any], agents: Dict[str, Agent], shared_cfg: Dict[str, Any], inputs: Dict[str, Any]) -> Dict[str, Task]:
-  merged = dict(inputs)
-  merged.update(shared_cfg.get("assumptions", {}))
-  merged.update({
-    "buffers": shared_cfg.get("buffers", {}),
-    "rounding": shared_cfg.get("currency", {}).get("rounding", {}),
-  })
-
+def build_tasks(tasks_cfg: Dict[str, Any], agents: Dict[str, Agent]) -> Dict[str, Task]:
+  """Tasks keep their {placeholder} templates; Crew.kickoff(inputs=...) fills them per run."""
   tasks: Dict[str, Task] = {}
 
   # pass 1: create
   for task_name, spec in tasks_cfg.items():
     agent_key = spec["agent"]
     task_kw: Dict[str, Any] = {
-      "description": spec["description"].format(**merged),
-      "expected_output": spec["expected_output"].format(**merged),
+      "description": spec["description"],
+      "expected_output": spec["expected_output"],
       "agent": agents[agent_key],
     }
     if task_name == "final_report_task":
@@ -329,6 +400,71 @@ def build_tasks(tasks_cfg: Dict[str, Any], agents: Dict[str, Agent], shared_cfg:
   return tasks
 
 
+PLAN_TASKS = ("trip_plan_task",)
+CATEGORY_TASKS = (
+  "flight_estimate_task",
+  "stay_estimate_task",
+  "transport_estimate_task",
+  "food_estimate_task",
+  "activity_estimate_task",
+  "docs_fees_estimate_task",
+)
+TAIL_TASKS = (
+  "risk_buffer_task",
+  "budget_aggregation_task",
+  "validation_task",
+  "final_report_task",
+)
+
+
+def _phase_crew(task_names: tuple[str, ...], tasks: Dict[str, Task], verbose: bool) -> Crew:
+  """Sequential crew over the named tasks. Context from earlier phases is read from task.output."""
+  phase_tasks = [tasks[name] for name in task_names]
+  agents = list({id(t.agent): t.agent for t in phase_tasks}.values())
+  return Crew(
+    agents=agents,
+    tasks=phase_tasks,
+    process=Process.sequential,
+    verbose=verbose,
+    tracing=True,
+    # The tools keep their own TTL caches of successful results; CrewAI's would also pin errors
+    cache=False,
+  )
+
+
+@dataclass
+class _PhaseCrews:
+  plan: Crew
+  categories: list[Crew]
+  tail: Crew
+
+
+def _build_phase_crews(cfg: Dict[str, Any]) -> _PhaseCrews:
+  """
+  Fresh agents, tasks and crews for one run. They are not reused: a Crew keeps an unbounded
+  tool-result cache on its agents, agents count retries across kickoffs, and tasks hold outputs.
+  """
+  shared_cfg = cfg["shared"]
+  verbose = shared_cfg.get("defaults", {}).get("verbose", True)
+  agents = build_agents(cfg["agents"], shared_cfg)
+  tasks = build_tasks(cfg["tasks"], agents)
+  return _PhaseCrews(
+    plan=_phase_crew(PLAN_TASKS, tasks, verbose),
+    categories=[_phase_crew((name,), tasks, verbose) for name in CATEGORY_TASKS],
+    tail=_phase_crew(TAIL_TASKS, tasks, verbose),
+  )
+
+
+async def _kickoff_concurrently(crews: list[Crew], max_parallel: int, inputs: Dict[str, Any]) -> list[Any]:
+  sem = asyncio.Semaphore(max(1, max_parallel))
+
+  async def _kickoff(crew: Crew) -> Any:
+    async with sem:
+      return await crew.kickoff_async(inputs=inputs)
+
+  return await asyncio.gather(*(_kickoff(c) for c in crews))
+
+
 def _trip_days_nights(start_date: str, end_date: str) -> tuple[int, int]:
   """Compute trip days and nights from YYYY-MM-DD strings. Returns (days, nights)."""
   try:
@@ -344,10 +480,96 @@ def _trip_days_nights(start_date: str, end_date: str) -> tuple[int, int]:
   return days, nights
 
 
-def run_budget_estimate(run: RunInputs, validate: bool = True) -> Dict[str, Any]:
-  shared_cfg = load_yaml(CONFIG_DIR / "config.yaml")
-  agents_cfg = load_yaml(CONFIG_DIR / "agents.yaml")
-  tasks_cfg = load_yaml(CONFIG_DIR / "tasks.yaml")
+def _dump(model: TravelBudgetEstimateV1, as_json: bool) -> Dict[str, Any] | bytes:
+  if as_json:
+    return model.model_dump_json(indent=2).encode("utf-8")
+  return model.model_dump()
+
+
+def _structured_output(result: Any) -> TravelBudgetEstimateV1 | None:
+  # final_report_task sets output_pydantic, so a successful run carries an already-validated model
+  model = getattr(result, "pydantic", None)
+  if model is None:
+    tasks_output = getattr(result, "tasks_output", None)
+    if tasks_output:
+      model = getattr(tasks_output[-1], "pydantic", None)
+  return model if isinstance(model, TravelBudgetEstimateV1) else None
+
+
+def _validated_raw(result: Any) -> TravelBudgetEstimateV1 | None:
+  # Common case: raw output is already schema-valid JSON; validate it straight from the string
+  raw = getattr(result, "raw", None)
+  if not isinstance(raw, str):
+    return None
+  try:
+    return TravelBudgetEstimateV1.model_validate_json(_strip_code_fences(raw))
+  except ValidationError:
+    return None
+
+
+def _parse_crew_result(result: Any, validate: bool) -> tuple[TravelBudgetEstimateV1 | None, Dict[str, Any] | None]:
+  """Return (model, None) for already-valid output, else (None, dict); raises ValueError if unparseable."""
+  structured = _structured_output(result)
+  if structured is None and validate:
+    structured = _validated_raw(result)
+  if structured is not None:
+    return structured, None
+  return None, coerce_json_dict(result)
+
+
+def _finalize_estimate(
+  structured: TravelBudgetEstimateV1 | None,
+  data: Dict[str, Any] | None,
+  user_meta: Dict[str, Any],
+  validate: bool,
+  return_json: bool,
+) -> Dict[str, Any] | bytes:
+  if structured is not None:
+    if validate:
+      # Already validated: only pin meta to the user's inputs, skip normalize + re-validate
+      meta = structured.meta.model_copy(update=user_meta)
+      return _dump(structured.model_copy(update={"meta": meta}), return_json)
+    data = structured.model_dump()
+
+  # Normalize meta structure to match TravelBudgetEstimateV1 schema
+  meta = data.get("meta")
+  if isinstance(meta, dict):
+    _apply_renames(meta, _META_RENAMES)
+    # Always reflect what the user entered in the UI, overriding model-generated values
+    meta.update(user_meta)
+  else:
+    data["meta"] = dict(user_meta)
+
+  # Normalize assumptions: schema expects an object, but model may output a list
+  assumptions = data.get("assumptions")
+  if isinstance(assumptions, list):
+    data["assumptions"] = {"notes": [str(item) for item in assumptions if str(item).strip()]}
+  elif not isinstance(assumptions, dict):
+    data["assumptions"] = {"notes": []}
+  else:
+    notes = assumptions.get("notes")
+    if not isinstance(notes, list):
+      data["assumptions"] = {**assumptions, "notes": [] if notes is None else [str(notes)]}
+
+  _normalize_estimates_and_totals(data)
+
+  if validate:
+    model = TravelBudgetEstimateV1.model_validate(data)  # raises ValidationError
+    return _dump(model, return_json)
+
+  if return_json:
+    return orjson.dumps(data, option=orjson.OPT_INDENT_2)
+  return data
+
+
+async def run_budget_estimate_async(run: RunInputs, validate: bool = True, return_json: bool = False) -> Dict[str, Any] | bytes:
+  """
+  Async variant of run_budget_estimate: crews run through kickoff_async, and
+  output parsing, normalization and validation run in a worker thread so
+  large LLM outputs don't block the event loop.
+  """
+  cfg = _load_merged_cfg()
+  shared_cfg = cfg["shared"]
 
   days, nights = _trip_days_nights(run.start_date, run.end_date)
 
@@ -363,55 +585,39 @@ def run_budget_estimate(run: RunInputs, validate: bool = True) -> Dict[str, Any]
     "days": days,
     "nights": nights,
   }
+  user_meta = {
+    "trip_title": run.trip_title,
+    "origin": run.origin,
+    "destination": run.destination,
+    "start_date": run.start_date,
+    "end_date": run.end_date,
+    "travelers": int(run.travelers),
+    "currency": run.currency,
+    "budget_style": run.budget_style,
+  }
 
-  agents = build_agents(agents_cfg, shared_cfg, inputs)
-  tasks = build_tasks(tasks_cfg, agents, shared_cfg, inputs)
-
-  MANAGER_AGENT_KEY = "budget_crew_manager"
-  worker_agents = [a for k, a in agents.items() if k != MANAGER_AGENT_KEY]
-  manager_agent = agents[MANAGER_AGENT_KEY]
-
-  crew = Crew(
-    agents=worker_agents,
-    tasks=[
-      tasks["trip_plan_task"],
-      tasks["flight_estimate_task"],
-      tasks["stay_estimate_task"],
-      tasks["transport_estimate_task"],
-      tasks["food_estimate_task"],
-      tasks["activity_estimate_task"],
-      tasks["docs_fees_estimate_task"],
-      tasks["risk_buffer_task"],
-      tasks["budget_aggregation_task"],
-      tasks["validation_task"],
-      tasks["final_report_task"],
-    ],
-    process=Process.hierarchical,
-    manager_agent=manager_agent,
-    verbose=shared_cfg.get("defaults", {}).get("verbose", True),
-    tracing=True,
-  )
+  # task_base (see _task_base) wins over inputs, as the config values always have
+  kickoff_inputs = dict(inputs)
+  kickoff_inputs.update(cfg["task_base"])
+
+  crews = await asyncio.to_thread(_build_phase_crews, cfg)
 
-  def _result_to_data(result: Any) -> Dict[str, Any]:
-    # Prefer structured output from final task when output_pydantic is set
-    if hasattr(result, "tasks") and result.tasks:
-      last_task = result.tasks[-1]
-      out = getattr(last_task, "output", None)
-      if out is not None and hasattr(out, "model_dump"):
-        return out.model_dump()
-      if isinstance(out, dict):
-        return out
-    return coerce_json_dict(result)
-
-  last_error = None
-  data = None
+  # Phase 1: trip plan; its output reaches later crews through each task's context
+  await crews.plan.kickoff_async(inputs=kickoff_inputs)
+
+  # Phase 2: the category estimates only depend on the plan, so run them concurrently
+  defaults = shared_cfg.get("defaults", {})
+  max_parallel = int(defaults.get("max_parallel_agents", len(CATEGORY_TASKS)))
+  await _kickoff_concurrently(crews.categories, max_parallel, kickoff_inputs)
+
+  # Phase 3: buffer, aggregation, validation and report, in order.
+  # A retry only reruns this crew; the plan and category outputs are kept
   for attempt in range(2):
-    result = crew.kickoff()
+    result = await crews.tail.kickoff_async(inputs=kickoff_inputs)
     try:
-      data = _result_to_data(result)
+      structured, data = await asyncio.to_thread(_parse_crew_result, result, validate)
       break
-    except (ValueError, json.JSONDecodeError) as e:
-      last_error = e
+    except ValueError as e:
       raw = getattr(result, "raw", getattr(result, "output", result))
       if isinstance(raw, str) and len(raw) > 2000:
         raw_preview = raw[:2000] + "..."
@@ -424,73 +630,15 @@ def run_budget_estimate(run: RunInputs, validate: bool = True) -> Dict[str, Any]
         raw_preview,
       )
       if attempt == 1:
-        raise last_error
+        raise
 
-  # Normalize meta structure to match TravelBudgetEstimateV1 schema
-  meta = data.get("meta")
-  if isinstance(meta, dict):
-    # Map nested trip_dates structure to flat fields
-    trip_dates = meta.get("trip_dates")
-    if isinstance(trip_dates, dict):
-      if "start" in trip_dates and "start_date" not in meta:
-        meta["start_date"] = trip_dates["start"]
-      if "end" in trip_dates and "end_date" not in meta:
-        meta["end_date"] = trip_dates["end"]
-      meta.pop("trip_dates", None)
-
-    # Map duration structure if present
-    duration = meta.get("duration")
-    if isinstance(duration, dict):
-      if "days" in duration and "days" not in meta:
-        meta["days"] = duration["days"]
-      if "nights" in duration and "nights" not in meta:
-        meta["nights"] = duration["nights"]
-      meta.pop("duration", None)
-
-    # Map party_size to travelers
-    if "party_size" in meta and "travelers" not in meta:
-      meta["travelers"] = meta["party_size"]
-      meta.pop("party_size", None)
-
-    # Ensure all required fields are present and match the original user inputs.
-    # We intentionally overwrite any model-generated values here so the final
-    # response always reflects what the user entered in the UI.
-    meta["trip_title"] = run.trip_title
-    meta["origin"] = run.origin
-    meta["destination"] = run.destination
-    meta["start_date"] = run.start_date
-    meta["end_date"] = run.end_date
-    meta["travelers"] = int(run.travelers)
-    meta["currency"] = run.currency
-    meta["budget_style"] = run.budget_style
-  else:
-    # If meta is missing or not a dict, create it from RunInputs
-    data["meta"] = {
-      "trip_title": run.trip_title,
-      "origin": run.origin,
-      "destination": run.destination,
-      "start_date": run.start_date,
-      "end_date": run.end_date,
-      "travelers": int(run.travelers),
-      "currency": run.currency,
-      "budget_style": run.budget_style,
-    }
+  return await asyncio.to_thread(_finalize_estimate, structured, data, user_meta, validate, return_json)
 
-  # Normalize assumptions: schema expects an object, but model may output a list
-  assumptions = data.get("assumptions")
-  if isinstance(assumptions, list):
-    data["assumptions"] = {"notes": [str(item) for item in assumptions if str(item).strip()]}
-  elif not isinstance(assumptions, dict):
-    data["assumptions"] = {"notes": []}
-  else:
-    notes = assumptions.get("notes")
-    if not isinstance(notes, list):
-      data["assumptions"] = {**assumptions, "notes": [] if notes is None else [str(notes)]}
 
-  _normalize_estimates_and_totals(data)
-
-  if validate:
-    model = TravelBudgetEstimateV1.model_validate(data)  # raises ValidationError
-    return model.model_dump()
-
-  return data
+def run_budget_estimate(run: RunInputs, validate: bool = True, return_json: bool = False) -> Dict[str, Any] | bytes:
+  """
+  Run the crew and return the estimate as a dict, or as indented UTF-8 JSON
+  bytes when return_json is set (serialized straight from the model).
+  Must not be called from a running event loop; use run_budget_estimate_async there.
+  """
+  return asyncio.run(run_budget_estimate_async(run, validate, return_json))
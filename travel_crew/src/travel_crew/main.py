@@ -1,11 +1,8 @@
 from __future__ import annotations
 
 import argparse
-import json
 from pathlib import Path
 
-from .crew import RunInputs, run_budget_estimate
-
 
 def main() -> None:
   p = argparse.ArgumentParser(description="Travel Budget Estimator (CrewAI) - JSON output")
@@ -22,6 +19,9 @@ def main() -> None:
 
   args = p.parse_args()
 
+  # Imported after argument parsing so --help and usage errors don't pay for CrewAI/pydantic/YAML
+  from .crew import RunInputs, run_budget_estimate
+
   out_path = Path(args.out)
   out_path.parent.mkdir(parents=True, exist_ok=True)
 
@@ -37,9 +37,10 @@ def main() -> None:
       budget_style=args.budget_style,
     ),
     validate=(not args.no_validate),
+    return_json=True,
   )
 
-  out_path.write_text(json.dumps(data, ensure_ascii=False, indent=2), encoding="utf-8")
+  out_path.write_bytes(data)
   print(str(out_path))
 
 
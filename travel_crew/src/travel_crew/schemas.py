@@ -1,14 +1,16 @@
 from __future__ import annotations
 
-from typing import List, Literal, Optional, Union
-from pydantic import BaseModel, Field, ConfigDict, field_validator
+from typing import Annotated, List, Literal, Optional, Union
+from pydantic import BaseModel, BeforeValidator, Field, ConfigDict, field_validator
 
 
 BudgetStyle = Literal["budget", "midrange", "luxury"]
 
 
 def _coerce_float(v: Union[int, float, str]) -> float:
-  if isinstance(v, (int, float)):
+  if type(v) is float:
+    return v
+  if type(v) is int:
     return float(v)
   s = str(v).strip()
   if not s:
@@ -16,6 +18,30 @@ def _coerce_float(v: Union[int, float, str]) -> float:
   return float(s)
 
 
+def _coerce_optional_float(v: Union[int, float, str, None]) -> Optional[float]:
+  if v is None or v == "":
+    return None
+  return _coerce_float(v)
+
+
+def _coerce_int(v: Union[int, str]) -> int:
+  if type(v) is int:
+    return v
+  return int(float(str(v).strip()))
+
+
+def _coerce_optional_int(v: Union[int, str, None]) -> Optional[int]:
+  if v is None or v == "":
+    return None
+  return _coerce_int(v)
+
+
+# Plain float fields rely on pydantic's lax coercion; these cover what it rejects ("" as None, "2.0" as int)
+OptionalFloatLike = Annotated[Optional[float], BeforeValidator(_coerce_optional_float)]
+IntLike = Annotated[int, BeforeValidator(_coerce_int)]
+OptionalIntLike = Annotated[Optional[int], BeforeValidator(_coerce_optional_int)]
+
+
 class LineItem(BaseModel):
   model_config = ConfigDict(extra="ignore")
   name: str
@@ -29,11 +55,6 @@ class LineItem(BaseModel):
       raise ValueError("line item name must not be empty")
     return v
 
-  @field_validator("amount", mode="before")
-  @classmethod
-  def amount_float(cls, v: Union[int, float, str]) -> float:
-    return _coerce_float(v)
-
 
 class SampleItem(BaseModel):
   model_config = ConfigDict(extra="ignore")
@@ -56,11 +77,6 @@ class CategoryEstimate(BaseModel):
   confidence: float = Field(..., ge=0, le=1)
   samples: List[SampleItem] = Field(default_factory=list)
 
-  @field_validator("low", "base", "high", "confidence", mode="before")
-  @classmethod
-  def numeric_float(cls, v: Union[int, float, str]) -> float:
-    return _coerce_float(v)
-
   @field_validator("base")
   @classmethod
   def base_ge_low(cls, v: float, info):
@@ -86,19 +102,12 @@ class Meta(BaseModel):
   destination: str
   start_date: str
   end_date: str
-  days: Optional[int] = Field(default=None, ge=0)
-  nights: Optional[int] = Field(default=None, ge=0)
-  travelers: int = Field(..., ge=1)
+  days: OptionalIntLike = Field(default=None, ge=0)
+  nights: OptionalIntLike = Field(default=None, ge=0)
+  travelers: IntLike = Field(..., ge=1)
   currency: str
   budget_style: BudgetStyle
 
-  @field_validator("travelers", mode="before")
-  @classmethod
-  def travelers_int(cls, v: Union[int, str]) -> int:
-    if isinstance(v, int):
-      return v
-    return int(float(str(v).strip()))
-
   @field_validator("budget_style", mode="before")
   @classmethod
   def budget_style_lower(cls, v: Union[str, object]) -> str:
@@ -107,31 +116,15 @@ class Meta(BaseModel):
       raise ValueError("budget_style must be one of: budget, midrange, luxury")
     return s
 
-  @field_validator("days", "nights", mode="before")
-  @classmethod
-  def optional_int(cls, v: Union[int, str, None]) -> Optional[int]:
-    if v is None or v == "":
-      return None
-    if isinstance(v, int):
-      return v
-    return int(float(str(v).strip()))
-
 
 class Assumptions(BaseModel):
   model_config = ConfigDict(extra="ignore")
 
-  meals_per_day: Optional[float] = Field(default=None, ge=0)
-  local_transport_days_ratio: Optional[float] = Field(default=None, ge=0, le=1)
-  activity_days_ratio: Optional[float] = Field(default=None, ge=0, le=1)
+  meals_per_day: OptionalFloatLike = Field(default=None, ge=0)
+  local_transport_days_ratio: OptionalFloatLike = Field(default=None, ge=0, le=1)
+  activity_days_ratio: OptionalFloatLike = Field(default=None, ge=0, le=1)
   notes: List[str] = Field(default_factory=list)
 
-  @field_validator("meals_per_day", "local_transport_days_ratio", "activity_days_ratio", mode="before")
-  @classmethod
-  def optional_float(cls, v: Union[int, float, str, None]) -> Optional[float]:
-    if v is None or v == "":
-      return None
-    return _coerce_float(v)
-
 
 class Estimates(BaseModel):
   model_config = ConfigDict(extra="ignore")
@@ -152,11 +145,6 @@ class Totals(BaseModel):
   high: float = Field(..., ge=0)
   per_person_base: float = Field(..., ge=0)
 
-  @field_validator("low", "base", "high", "per_person_base", mode="before")
-  @classmethod
-  def numeric_float(cls, v: Union[int, float, str]) -> float:
-    return _coerce_float(v)
-
   @field_validator("high")
   @classmethod
   def high_ge_base(cls, v: float, info):
@@ -174,11 +162,6 @@ class Contingency(BaseModel):
   buffer_amount: float = Field(..., ge=0)
   total_with_buffer: float = Field(..., ge=0)
 
-  @field_validator("buffer_rate_used", "base_subtotal", "buffer_amount", "total_with_buffer", mode="before")
-  @classmethod
-  def numeric_float(cls, v: Union[int, float, str]) -> float:
-    return _coerce_float(v)
-
 
 class ValidationBlock(BaseModel):
   model_config = ConfigDict(extra="ignore")
@@ -188,11 +171,6 @@ class ValidationBlock(BaseModel):
   recommendations: List[str] = Field(default_factory=list)
   confidence: float = Field(..., ge=0, le=1)
 
-  @field_validator("confidence", mode="before")
-  @classmethod
-  def confidence_float(cls, v: Union[int, float, str]) -> float:
-    return _coerce_float(v)
-
 
 class TravelBudgetEstimateV1(BaseModel):
   model_config = ConfigDict(extra="ignore")
@@ -0,0 +1,38 @@
+from __future__ import annotations
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Generic, Hashable, Optional, TypeVar
+
+V = TypeVar("V")
+
+
+class TTLCache(Generic[V]):
+  """Thread-safe LRU bounded to maxsize entries, each expiring ttl seconds after it was stored."""
+
+  def __init__(self, maxsize: int, ttl: float):
+    self._maxsize = maxsize
+    self._ttl = ttl
+    self._data: "OrderedDict[Hashable, tuple[float, V]]" = OrderedDict()
+    self._lock = threading.Lock()
+
+  def get(self, key: Hashable) -> Optional[V]:
+    now = time.monotonic()
+    with self._lock:
+      hit = self._data.get(key)
+      if hit is None:
+        return None
+      if hit[0] <= now:
+        del self._data[key]
+        return None
+      self._data.move_to_end(key)
+      return hit[1]
+
+  def set(self, key: Hashable, value: V) -> None:
+    expires = time.monotonic() + self._ttl
+    with self._lock:
+      self._data[key] = (expires, value)
+      self._data.move_to_end(key)
+      while len(self._data) > self._maxsize:
+        self._data.popitem(last=False)
@@ -1,19 +1,160 @@
 from __future__ import annotations
 
-import json
 import os
-from typing import Any, Dict, List, Type
-
+import threading
+import urllib.request
+from dataclasses import dataclass
+from itertools import islice
+from typing import Annotated, Any, Dict, Type
+from urllib.error import URLError
+
+import orjson
+import urllib3
 from amadeus import Client, ResponseError
 from crewai.tools import BaseTool
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field, PrivateAttr, StringConstraints
+
+from ._cache import TTLCache
+
+
+def _dumps(obj: Any) -> str:
+  # orjson always emits UTF-8, matching json.dumps(..., ensure_ascii=False)
+  return orjson.dumps(obj).decode()
+
+
+def _emit_offers(query_used: bytes, offer_count: int, samples: bytes) -> str:
+  """Success output: join pre-encoded fragments instead of building and encoding a wrapper dict."""
+  return (
+    b'{"query_used":' + query_used
+    + b',"offer_count":' + str(offer_count).encode()
+    + b',"samples":' + samples + b"}"
+  ).decode()
+
+
+# One keep-alive pool for every Amadeus call in the process (token refreshes and searches).
+# Retry policy: up to 3 retries with exponential backoff (0.3s, 0.6s, 1.2s; Retry-After is
+# honoured) on connection errors, and on 429/5xx for idempotent requests only, so a token
+# POST is never re-sent. Once retries run out the last response is returned as-is and the
+# SDK raises its ResponseError for it. Each attempt is bounded by the connect/read timeout.
+_HTTP_POOL = urllib3.PoolManager(
+  maxsize=32,
+  block=False,
+  timeout=urllib3.Timeout(connect=5.0, read=30.0),
+  retries=urllib3.Retry(
+    total=3,
+    backoff_factor=0.3,
+    status_forcelist=(429, 500, 502, 503, 504),
+    raise_on_status=False,
+  ),
+)
+
+
+class _PooledResponse:
+  """The parts of urllib's HTTPResponse that the amadeus SDK parser reads."""
+
+  def __init__(self, resp: urllib3.BaseHTTPResponse):
+    self.status = resp.status
+    self._headers = resp.headers
+    self._body = resp.data
+
+  def info(self) -> Any:
+    return self._headers
+
+  def read(self) -> bytes:
+    return self._body
+
+
+# Compressed responses (brotli/zstd too when installed); urllib3 decodes them before .data
+_ACCEPT_ENCODING = urllib3.util.make_headers(accept_encoding=True)
+
+
+def _pooled_http(request: urllib.request.Request) -> _PooledResponse:
+  """amadeus Client ``http`` hook: send the SDK's urllib Request through _HTTP_POOL."""
+  headers = dict(request.header_items())
+  headers.update(_ACCEPT_ENCODING)
+  try:
+    resp = _HTTP_POOL.request(
+      request.get_method(),
+      request.full_url,
+      body=request.data,
+      headers=headers,
+    )
+  except urllib3.exceptions.HTTPError as e:
+    # The SDK turns URLError into its NetworkError
+    raise URLError(e) from e
+  return _PooledResponse(resp)
+
+
+# Successful search results by query; agents often repeat the same search while reasoning
+_OFFER_CACHE: TTLCache[str] = TTLCache(maxsize=512, ttl=900)
+
+_CLIENT: Client | None = None
+_CLIENT_LOCK = threading.Lock()
+
+
+def _shared_client(api_key: str, api_secret: str, hostname: str) -> Client:
+  """One authenticated client per process, so tool instances also share its access token."""
+  global _CLIENT
+  with _CLIENT_LOCK:
+    if _CLIENT is None:
+      _CLIENT = Client(
+        client_id=api_key,
+        client_secret=api_secret,
+        hostname=hostname,
+        http=_pooled_http,
+      )
+    return _CLIENT
+
+
+@dataclass(slots=True)
+class _Sample:
+  """One flight price sample; orjson serializes slotted dataclasses directly, in field order."""
+
+  label: str
+  price_text: str | None
+  currency: str | None
+  url: str | None = None
+
+
+def _extract_sample(offer: Dict[str, Any], fallback_currency: str) -> _Sample:
+  """Map one flight offer to a sample; direct key access, falling back per field on malformed offers."""
+  try:
+    price = offer["price"]
+    total = price.get("grandTotal") or price.get("total")
+    currency_code = price.get("currency") or fallback_currency
+  except (KeyError, TypeError, AttributeError):
+    total, currency_code = None, fallback_currency
+
+  validating = offer.get("validatingAirlineCodes")
+  airline = str(validating[0]).strip() if validating else ""
+
+  try:
+    segments = offer["itineraries"][0]["segments"]
+    o_code = segments[0]["departure"]["iataCode"]
+    d_code = segments[-1]["arrival"]["iataCode"]
+  except (KeyError, IndexError, TypeError):
+    route = ""
+  else:
+    route = f"{o_code}-{d_code}" if o_code and d_code else ""
+
+  return _Sample(
+    f"{airline} {route}" if airline and route else (airline or route or "Flight offer"),
+    str(total) if total is not None else None,
+    str(currency_code) if currency_code else None,
+  )
+
+
+# Three-letter code, upper-cased; checked by pydantic-core rather than a Python validator
+IataCode = Annotated[str, StringConstraints(to_upper=True, pattern=r"^[A-Za-z]{3}$")]
 
 
 class AmadeusFlightOffersInput(BaseModel):
   """Input schema for Amadeus flight offers search."""
 
-  origin: str = Field(..., description="Origin IATA code, e.g. KUL")
-  destination: str = Field(..., description="Destination IATA code, e.g. NRT")
+  model_config = ConfigDict(extra="forbid", frozen=True, str_strip_whitespace=True)
+
+  origin: IataCode = Field(..., description="Origin IATA code, e.g. KUL")
+  destination: IataCode = Field(..., description="Destination IATA code, e.g. NRT")
   start_date: str = Field(..., description="Departure date YYYY-MM-DD")
   end_date: str = Field(..., description="Return date YYYY-MM-DD")
   travelers: int = Field(..., ge=1, description="Number of adult travelers")
@@ -32,6 +173,11 @@ class AmadeusFlightOffersTool(BaseTool):
   )
   args_schema: Type[BaseModel] = AmadeusFlightOffersInput
 
+  # Declared so pydantic keeps them in __pydantic_private__ rather than the instance __dict__
+  _client: Client | None = PrivateAttr(default=None)
+  _config_error: str | None = PrivateAttr(default=None)
+  _error_tail: str | None = PrivateAttr(default=None)
+
   def __init__(self, **data: Any):
     super().__init__(**data)
 
@@ -40,19 +186,18 @@ class AmadeusFlightOffersTool(BaseTool):
     env = (os.getenv("AMADEUS_ENV") or "test").strip().lower()
     hostname = "production" if env.startswith("prod") else "test"
 
-    self._config_error: str | None = None
     if not api_key or not api_secret:
       self._config_error = (
         "Amadeus credentials missing: set AMADEUS_API_KEY and AMADEUS_API_SECRET. "
         "Using heuristic estimates instead."
       )
-      self._client = None
     else:
-      self._client = Client(
-        client_id=api_key,
-        client_secret=api_secret,
-        hostname=hostname,
-      )
+      self._client = _shared_client(api_key, api_secret, hostname)
+
+    # The error output only varies by query_used, so serialize the rest once
+    if self._config_error or self._client is None:
+      error = self._config_error or "Amadeus client not initialised."
+      self._error_tail = ',"error":' + _dumps(error) + "}"
 
   def _run(
     self,
@@ -72,14 +217,13 @@ class AmadeusFlightOffersTool(BaseTool):
       "currency": currency,
     }
 
-    if self._config_error or self._client is None:
-      return json.dumps(
-        {
-          "query_used": query_used,
-          "error": self._config_error or "Amadeus client not initialised.",
-        },
-        ensure_ascii=False,
-      )
+    if self._error_tail is not None:
+      return '{"query_used":' + _dumps(query_used) + self._error_tail
+
+    cache_key = (origin, destination, start_date, end_date, travelers, currency)
+    cached = _OFFER_CACHE.get(cache_key)
+    if cached is not None:
+      return cached
 
     try:
       response = self._client.shopping.flight_offers_search.get(
@@ -92,65 +236,20 @@ class AmadeusFlightOffersTool(BaseTool):
         max=10,
       )
     except ResponseError as e:
-      return json.dumps(
+      # Every SDK failure (HTTP status, network via URLError, body parsing) is a ResponseError subclass
+      return _dumps(
         {
           "query_used": query_used,
           "error": f"Amadeus Flight Offers Search failed: {e}",
         },
-        ensure_ascii=False,
-      )
-    except Exception as e:  # pragma: no cover - defensive
-      return json.dumps(
-        {
-          "query_used": query_used,
-          "error": f"Unexpected error calling Amadeus: {e}",
-        },
-        ensure_ascii=False,
-      )
-
-    offers: List[Dict[str, Any]] = []
-    if isinstance(response.data, list):
-      offers = [o for o in response.data if isinstance(o, dict)]
-
-    samples: List[Dict[str, Any]] = []
-    for offer in offers[:5]:
-      price = offer.get("price", {}) or {}
-      total = price.get("grandTotal") or price.get("total")
-      currency_code = price.get("currency") or currency
-
-      label_parts: List[str] = []
-      validating = offer.get("validatingAirlineCodes") or []
-      if validating:
-        label_parts.append(str(validating[0]))
-
-      itineraries = offer.get("itineraries") or []
-      if itineraries:
-        first_itin = itineraries[0] or {}
-        segments = first_itin.get("segments") or []
-        if segments:
-          first_seg = segments[0] or {}
-          last_seg = segments[-1] or {}
-          o_code = (first_seg.get("departure") or {}).get("iataCode")
-          d_code = (last_seg.get("arrival") or {}).get("iataCode")
-          if o_code and d_code:
-            label_parts.append(f"{o_code}-{d_code}")
-
-      label = " ".join(label_parts).strip() or "Flight offer"
-
-      samples.append(
-        {
-          "label": label,
-          "price_text": str(total) if total is not None else None,
-          "currency": str(currency_code) if currency_code else None,
-          "url": None,
-        }
       )
 
-    payload: Dict[str, Any] = {
-      "query_used": query_used,
-      "offer_count": len(offers),
-      "samples": samples,
-    }
+    data = response.data if isinstance(response.data, list) else []
+    # Filter lazily and stop after the five offers that become samples
+    offers = (o for o in data if isinstance(o, dict))
+    samples = [_extract_sample(offer, currency) for offer in islice(offers, 5)]
 
-    return json.dumps(payload, ensure_ascii=False)
+    out = _emit_offers(orjson.dumps(query_used), len(data), orjson.dumps(samples))
+    _OFFER_CACHE.set(cache_key, out)
+    return out
 
@@ -1,17 +1,48 @@
 from __future__ import annotations
 
-import json
 import os
-from typing import Any, Dict, List, Type
+import threading
+from concurrent.futures import Future
+from typing import Any, ClassVar, Dict, List, Type
 
+import orjson
 from crewai.tools import BaseTool
 from crewai_tools import SerperDevTool
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field, PrivateAttr
+
+from ._cache import TTLCache
+
+
+def _dumps(obj: Any) -> str:
+    # orjson always emits UTF-8, matching json.dumps(..., ensure_ascii=False)
+    return orjson.dumps(obj).decode()
+
+
+def _emit_search(site_query: str, key: bytes, value: bytes) -> str:
+    """Search output: join pre-encoded fragments instead of building and encoding a wrapper dict."""
+    return (b'{"query_used":' + orjson.dumps(site_query) + key + value + b"}").decode()
+
+
+# Successful results by (domain, query); agents often repeat the same search while reasoning
+_SEARCH_CACHE: TTLCache[str] = TTLCache(maxsize=512, ttl=900)
+
+# Searches currently running, so concurrent identical calls share one Serper request
+_INFLIGHT: Dict[tuple[str, str], Future[str]] = {}
+_INFLIGHT_LOCK = threading.Lock()
+_INFLIGHT_MAX = 256
+
+_MISSING_KEY_MSG = (
+    "Serper-based web search is unavailable because SERPER_API_KEY is not "
+    "set in the environment. Fall back to heuristic estimates and clearly "
+    "note this limitation in your assumptions."
+)
 
 
 class _DomainSearchInput(BaseModel):
     """Generic input schema for domain-scoped Serper search tools."""
 
+    model_config = ConfigDict(extra="forbid", frozen=True, str_strip_whitespace=True)
+
     query: str = Field(
         ...,
         description=(
@@ -26,27 +57,64 @@ class _BaseDomainSerperTool(BaseTool):
 
     args_schema: Type[BaseModel] = _DomainSearchInput
     _domain: str
+    _serper: SerperDevTool | None = PrivateAttr(default=None)
+    _api_key_present: bool = PrivateAttr(default=False)
+
+    # One SerperDevTool for every domain tool, and a cap on concurrent Serper calls
+    _SHARED_SERPER: ClassVar[SerperDevTool | None] = None
+    _SHARED_SERPER_LOCK: ClassVar[threading.Lock] = threading.Lock()
+    _SEMAPHORE: ClassVar[threading.Semaphore] = threading.Semaphore(8)
 
     def __init__(self, **data):
         super().__init__(**data)
-        # Instantiate the underlying SerperDevTool once per tool instance.
-        self._serper = SerperDevTool()
+        with _BaseDomainSerperTool._SHARED_SERPER_LOCK:
+            if _BaseDomainSerperTool._SHARED_SERPER is None:
+                _BaseDomainSerperTool._SHARED_SERPER = SerperDevTool()
+        self._serper = _BaseDomainSerperTool._SHARED_SERPER
+        # The key is read once; _run only branches on the cached flag.
+        self._api_key_present = bool(os.environ.get("SERPER_API_KEY"))
 
     def _run(self, query: str) -> str:
-        api_key = os.getenv("SERPER_API_KEY")
-        if not api_key:
-            return (
-                "Serper-based web search is unavailable because SERPER_API_KEY is not "
-                "set in the environment. Fall back to heuristic estimates and clearly "
-                "note this limitation in your assumptions."
-            )
+        if not self._api_key_present:
+            return _MISSING_KEY_MSG
 
         site_query = f"site:{self._domain} {query}".strip()
+        cache_key = (self._domain, query)
+        cached = _SEARCH_CACHE.get(cache_key)
+        if cached is not None:
+            return cached
+
+        with _INFLIGHT_LOCK:
+            fut = _INFLIGHT.get(cache_key)
+            leader = fut is None
+            if leader:
+                fut = Future()
+                if len(_INFLIGHT) >= _INFLIGHT_MAX:
+                    # Oldest entry stops being joinable; its own caller is unaffected
+                    _INFLIGHT.pop(next(iter(_INFLIGHT)))
+                _INFLIGHT[cache_key] = fut
+        if not leader:
+            return fut.result()
 
         try:
-            result = self._serper.run(search_query=site_query)
+            out = self._search(site_query, cache_key)
+        except BaseException as e:
+            fut.set_exception(e)
+            raise
+        else:
+            fut.set_result(out)
+            return out
+        finally:
+            with _INFLIGHT_LOCK:
+                if _INFLIGHT.get(cache_key) is fut:
+                    del _INFLIGHT[cache_key]
+
+    def _search(self, site_query: str, cache_key: tuple[str, str]) -> str:
+        try:
+            with self._SEMAPHORE:
+                result = self._serper.run(search_query=site_query)
         except Exception as e:
-            return json.dumps(
+            return _dumps(
                 {
                     "query_used": site_query,
                     "error": (
@@ -55,23 +123,20 @@ class _BaseDomainSerperTool(BaseTool):
                         "note this limitation in your assumptions."
                      ),
                 },
-                ensure_ascii=False,
             )
 
-        payload: Dict[str, Any] = {"query_used": site_query}
-
-        data: Any = result
-        if isinstance(result, str):
-            try:
-                data = json.loads(result)
-            except Exception:
-                data = None
-        elif not isinstance(result, dict):
-            # Best-effort stringification for unexpected shapes
-            try:
-                data = json.loads(json.dumps(result, default=str))
-            except Exception:
-                data = None
+        # SerperDevTool returns a dict; only other shapes need converting
+        data: Any = None
+        if isinstance(result, dict):
+            data = result
+        elif isinstance(result, str):
+            if result:
+                try:
+                    data = orjson.loads(result)
+                except orjson.JSONDecodeError:
+                    pass
+        elif hasattr(result, "__dict__"):
+            data = vars(result)
 
         samples: List[Dict[str, Any]] = []
         if isinstance(data, dict):
@@ -96,11 +161,11 @@ class _BaseDomainSerperTool(BaseTool):
                     )
 
         if samples:
-            payload["samples"] = samples
+            out = _emit_search(site_query, b',"samples":', orjson.dumps(samples))
         else:
-            payload["raw"] = result
-
-        return json.dumps(payload, ensure_ascii=False)
+            out = _emit_search(site_query, b',"raw":', orjson.dumps(result))
+        _SEARCH_CACHE.set(cache_key, out)
+        return out
 
 
 class CheapflightsSearchTool(_BaseDomainSerperTool):